@@ -113,7 +113,14 @@ f5_agent_opts = [
     cfg.BoolOpt('migration', default=False,
                 help=_("Enable migration mode (disable syncing active devices)")),
     cfg.BoolOpt('async_mode', default=False,
-                help=_("Use asynchronous mode for posting as3 declarations.")),
+                help=_("Use asynchronous mode for posting as3 declarations. "
+                       "See async_payload_threshold for posting small "
+                       "declarations synchronously.")),
+    cfg.IntOpt('async_payload_threshold', default=0, min=0,
+               help=_("When async_mode is enabled, only post AS3 declarations "
+                      "larger than this size (in bytes) asynchronously, "
+                      "smaller ones are posted synchronously. Default 0 "
+                      "posts every declaration asynchronously.")),
     cfg.IntOpt('persist_every', default=-1,
                 help=_("When persist_every >= 0 make the whole working configuration "
                        "persistent on targetHost after (and only if) this request "
@@ -130,7 +137,7 @@ f5_agent_opts = [
                help=_("Name of iRule used for allowed_cidrs filtering.")),
 ]
 
-f5_tls_shared = {
+f5_tls_shared = [
     cfg.BoolOpt('forward_proxy_bypass', default=None,
                 help=_("Enables or disables (default) SSL forward proxy bypass.")),
     cfg.BoolOpt('forward_proxy', default=None,
@@ -147,17 +154,16 @@ f5_tls_shared = {
                        "it is not strictly necessary to generate a new DH key during each "
                        "handshake, but F5 Networks recommends it. Enable the Single DH Use "
                        "option whenever temporary or ephemeral DH parameters are used.")),
-}
+]
 
-f5_tls_server_opts = {
+f5_tls_server_opts = [
     cfg.BoolOpt('cache_certificate', default=None,
                 help=_("Enables or disables (default) caching certificates by IP address "
                        "and port number.")),
     cfg.BoolOpt('stapler_ocsp', default=None,
                 help=_("Specifies whether to enable OCSP stapling.")),
-}
-f5_tls_server_opts.update(f5_tls_shared)
-f5_tls_client_opts = f5_tls_shared
+] + f5_tls_shared
+f5_tls_client_opts = list(f5_tls_shared)
 
 f5_networking_opts = [
     cfg.BoolOpt('caching', default=True,
@@ -18,6 +18,7 @@ from oslo_log import log as logging
 
 from octavia_f5.common import constants
 from octavia_f5.restclient import as3exceptions
+from octavia_f5.utils import json_utils
 
 LOG = logging.getLogger(__name__)
 
@@ -94,6 +95,26 @@ class AS3(BaseDescription):
         setattr(self, 'logLevel', self.LOG_MAP.get(_log_level, 'warning'))
         setattr(self, 'trace', _log_level == logging.TRACE)
 
+    def __setattr__(self, key, value):
+        # Any change of the declaration invalidates the cached serialization
+        self.__dict__.pop('_serialized', None)
+        super(AS3, self).__setattr__(key, value)
+
+    def to_dict(self):
+        data = super(AS3, self).to_dict()
+        data.pop('_serialized', None)
+        return data
+
+    def serialize(self):
+        """ Returns the JSON encoded declaration. The result is cached until an attribute
+        of this AS3 object is set, changes to nested objects are not detected.
+
+        :return: bytes
+        """
+        if '_serialized' not in self.__dict__:
+            self.__dict__['_serialized'] = json_utils.dumps(self.to_dict())
+        return self.__dict__['_serialized']
+
     def set_action(self, action):
         if action not in self.ACTIONS:
             raise as3exceptions.TypeNotSupportedException
@@ -16,6 +16,8 @@ from urllib import parse
 
 import json
 
+from octavia_f5.utils import json_utils
+
 
 def get_response_log(response):
     """ Formats AS3 requests response and prints them pretty
@@ -35,7 +37,7 @@ def get_response_log(response):
     # Format Request
     if request.body:
         try:
-            parsed = json.loads(request.body)
+            parsed = json_utils.loads(request.body)
             msg += json.dumps(parsed, sort_keys=True, indent=4)
         except ValueError:
             # No json, just dump
@@ -44,7 +46,7 @@ def get_response_log(response):
     # Format Response
     if 'application/json' in response.headers.get('Content-Type'):
         try:
-            parsed = response.json()
+            parsed = json_utils.loads(response.content)
             if 'results' in parsed:
                 parsed = parsed['results']
             msg += json.dumps(parsed, sort_keys=True, indent=4)
@@ -55,3 +57,13 @@ def get_response_log(response):
         msg += response.txt
 
     return msg.strip()
+
+
+class LazyResponseLog(object):
+    """ Defers formatting of the response log until the log record is actually emitted """
+
+    def __init__(self, response):
+        self.response = response
+
+    def __str__(self):
+        return get_response_log(self.response)
@@ -12,6 +12,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import dataclasses
+import functools
+import sys
+
 from oslo_config import cfg
 from oslo_log import log as logging
 
@@ -23,23 +27,35 @@ from octavia_f5.restclient.as3classes import TLS_Server, TLS_Client, Pointer
 CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
+# Maps TLS versions to the AS3 TLS_Server/TLS_Client properties enabling them
+TLS_VERSION_FLAGS = {
+    # Enable/Disable all SSL versions at once
+    lib_consts.SSL_VERSION_3: 'sslEnabled',
+    lib_consts.TLS_VERSION_1: 'tls1_0Enabled',
+    # Note: tls_1_1 is only supported in tmos version 14.0+
+    lib_consts.TLS_VERSION_1_1: 'tls1_1Enabled',
+    lib_consts.TLS_VERSION_1_2: 'tls1_2Enabled',
+}
+
 
+@functools.lru_cache(maxsize=8192)
 def get_listener_name(listener_id):
     """Returns AS3 object name for TLS profiles related to listeners
 
     :param listener_id: octavia listener id
     :return: AS3 object name
     """
-    return "{}{}".format(constants.PREFIX_TLS_LISTENER, listener_id)
+    return sys.intern("{}{}".format(constants.PREFIX_TLS_LISTENER, listener_id))
 
 
+@functools.lru_cache(maxsize=8192)
 def get_pool_name(pool_id):
     """Returns AS3 object name for TLS profiles related to pools
 
     :param pool_id: octavia pool id
     :return: AS3 object name
     """
-    return "{}{}".format(constants.PREFIX_TLS_POOL, pool_id)
+    return sys.intern("{}{}".format(constants.PREFIX_TLS_POOL, pool_id))
 
 
 def filter_cipher_suites(cipher_suites, object_print_name, object_id):
@@ -69,15 +85,64 @@ def filter_cipher_suites(cipher_suites, object_print_name, object_id):
     return ':'.join(cipher_suites_list)
 
 
-def get_tls_server(certificate_ids, listener, authentication_ca=None, allow_renegotiation=True, cipher_group=None):
-    """ returns AS3 TLS_Server
+@dataclasses.dataclass(frozen=True)
+class TlsServerConf(object):
+    """ Immutable snapshot of the f5_tls_server options """
+    forward_proxy_bypass: bool = None
+    forward_proxy: bool = None
+    insert_empty_fragments: bool = None
+    single_use_dh: bool = None
+    cache_certificate: bool = None
+    stapler_ocsp: bool = None
 
-    :param certificate_ids: reference ids to AS3 certificate objs
-    :param listener: Listener object
-    :param authentication_ca: reference id to AS3 auth-ca obj
-    :param allow_renegotiation: Whether to allow TLS renegotiation. Has to be False when HTTP2 is used.
-    :param cipher_group: name of Cipher Group has to be used for this listener
-    :return: TLS_Server
+
+@dataclasses.dataclass(frozen=True)
+class TlsClientConf(object):
+    """ Immutable snapshot of the f5_tls_client options """
+    forward_proxy_bypass: bool = None
+    forward_proxy: bool = None
+    insert_empty_fragments: bool = None
+    single_use_dh: bool = None
+
+
+_SERVER_CONF = None
+_CLIENT_CONF = None
+
+
+def _get_server_conf():
+    """ Returns the (lazily created) snapshot of the f5_tls_server options """
+    global _SERVER_CONF
+    if _SERVER_CONF is None:
+        _SERVER_CONF = TlsServerConf(**{field.name: getattr(CONF.f5_tls_server, field.name)
+                                        for field in dataclasses.fields(TlsServerConf)})
+    return _SERVER_CONF
+
+
+def _get_client_conf():
+    """ Returns the (lazily created) snapshot of the f5_tls_client options """
+    global _CLIENT_CONF
+    if _CLIENT_CONF is None:
+        _CLIENT_CONF = TlsClientConf(**{field.name: getattr(CONF.f5_tls_client, field.name)
+                                        for field in dataclasses.fields(TlsClientConf)})
+    return _CLIENT_CONF
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_certificates(certificate_ids):
+    """ Returns (and caches) the AS3 certificate references of a TLS_Server.
+    The returned tuple is shared between callers, the referenced dicts must not be modified.
+
+    :param certificate_ids: frozenset of reference ids to AS3 certificate objs
+    :return: tuple of certificate references
+    """
+    return tuple({'certificate': cert_id} for cert_id in certificate_ids)
+
+
+@functools.lru_cache(maxsize=4096)
+def _build_tls_server_args(cipher_group, tls_versions, client_authentication,
+                           authentication_ca, allow_renegotiation, conf):
+    """ Builds (and caches) the arguments for an AS3 TLS_Server. All parameters have to be hashable.
+    The returned dict is shared between callers and must not be modified.
     """
     mode_map = {
         'NONE': 'ignore',
@@ -85,9 +150,7 @@ def get_tls_server(certificate_ids, listener, authentication_ca=None, allow_rene
         'MANDATORY': 'require'
     }
 
-    service_args = {
-        'certificates': [{'certificate': cert_id} for cert_id in set(certificate_ids)],
-    }
+    service_args = {}
 
     if cipher_group:
         service_args['cipherGroup'] = {'use': cipher_group}
@@ -95,49 +158,35 @@ def get_tls_server(certificate_ids, listener, authentication_ca=None, allow_rene
     if authentication_ca:
         service_args['authenticationTrustCA'] = authentication_ca
         service_args['authenticationInviteCA'] = authentication_ca
-        service_args['authenticationMode'] = mode_map[listener.client_authentication]
-
-    if CONF.f5_tls_server.forward_proxy_bypass is not None:
-        service_args['forwardProxyBypassEnabled'] = CONF.f5_tls_server.forward_proxy_bypass
-    if CONF.f5_tls_server.forward_proxy is not None:
-        service_args['forwardProxyEnabled'] = CONF.f5_tls_server.forward_proxy
-    if CONF.f5_tls_server.insert_empty_fragments is not None:
-        service_args['insertEmptyFragmentsEnabled'] = CONF.f5_tls_server.insert_empty_fragments
-    if CONF.f5_tls_server.single_use_dh is not None:
-        service_args['singleUseDhEnabled'] = CONF.f5_tls_server.single_use_dh
-    if CONF.f5_tls_server.cache_certificate is not None:
-        service_args['cacheCertificateEnabled'] = CONF.f5_tls_server.cache_certificate
-    if CONF.f5_tls_server.stapler_ocsp is not None:
-        service_args['staplerOCSPEnabled'] = CONF.f5_tls_server.stapler_ocsp
-
-    # LBs created before Ussuri may have TLS-enabled listeners with no tls_versions specified
-    tls_versions = listener.tls_versions or CONF.api_settings.default_listener_tls_versions
+        service_args['authenticationMode'] = mode_map[client_authentication]
+
+    if conf.forward_proxy_bypass is not None:
+        service_args['forwardProxyBypassEnabled'] = conf.forward_proxy_bypass
+    if conf.forward_proxy is not None:
+        service_args['forwardProxyEnabled'] = conf.forward_proxy
+    if conf.insert_empty_fragments is not None:
+        service_args['insertEmptyFragmentsEnabled'] = conf.insert_empty_fragments
+    if conf.single_use_dh is not None:
+        service_args['singleUseDhEnabled'] = conf.single_use_dh
+    if conf.cache_certificate is not None:
+        service_args['cacheCertificateEnabled'] = conf.cache_certificate
+    if conf.stapler_ocsp is not None:
+        service_args['staplerOCSPEnabled'] = conf.stapler_ocsp
 
     # Set TLS versions
-    # Enable/Disable all SSL versions at once
-    service_args['sslEnabled'] = lib_consts.SSL_VERSION_3 in tls_versions
-    service_args['tls1_0Enabled'] = lib_consts.TLS_VERSION_1 in tls_versions
-    # Note: tls_1_1 is only supported in tmos version 14.0+
-    service_args['tls1_1Enabled'] = lib_consts.TLS_VERSION_1_1 in tls_versions
-    service_args['tls1_2Enabled'] = lib_consts.TLS_VERSION_1_2 in tls_versions
+    service_args.update({flag: version in tls_versions for version, flag in TLS_VERSION_FLAGS.items()})
     # Control Renegotiation depends on HTTP2
     service_args['renegotiationEnabled'] = allow_renegotiation
 
-    return TLS_Server(**service_args)
+    return service_args
 
 
-def get_tls_client(pool, trust_ca=None, client_cert=None, crl_file=None, allow_renegotiation=True, cipher_group=None):
-    """ returns AS3 TLS_Client
-
-    :param pool: The pool for which to create the TLS client
-    :param trust_ca: reference to AS3 trust_ca obj
-    :param client_cert: reference to AS3 client_cert
-    :param crl_file: reference to AS3 crl_file
-    :param allow_renegotiation: Whether to allow TLS renegotiation. Has to be False when HTTP2 is used.
-    :param cipher_group: name of Cipher Group has to be used for this pool
-    :return: TLS_Client
+@functools.lru_cache(maxsize=4096)
+def _build_tls_client_args(trust_ca, client_cert, crl_file, cipher_group, tls_versions,
+                           allow_renegotiation, conf):
+    """ Builds (and caches) the arguments for an AS3 TLS_Client. All parameters have to be hashable.
+    The returned dict is shared between callers and must not be modified.
     """
-
     service_args = {}
 
     if cipher_group:
@@ -151,26 +200,74 @@ def get_tls_client(pool, trust_ca=None, client_cert=None, crl_file=None, allow_r
     if crl_file:
         service_args['crlFile'] = crl_file
 
-    if CONF.f5_tls_client.forward_proxy_bypass is not None:
-        service_args['forwardProxyBypassEnabled'] = CONF.f5_tls_client.forward_proxy_bypass
-    if CONF.f5_tls_client.forward_proxy is not None:
-        service_args['forwardProxyEnabled'] = CONF.f5_tls_client.forward_proxy
-    if CONF.f5_tls_client.insert_empty_fragments is not None:
-        service_args['insertEmptyFragmentsEnabled'] = CONF.f5_tls_client.insert_empty_fragments
-    if CONF.f5_tls_client.single_use_dh is not None:
-        service_args['singleUseDhEnabled'] = CONF.f5_tls_client.single_use_dh
-
-    # LBs created before Ussuri may have TLS-enabled pools with no tls_versions specified
-    tls_versions = pool.tls_versions or CONF.api_settings.default_pool_tls_versions
+    if conf.forward_proxy_bypass is not None:
+        service_args['forwardProxyBypassEnabled'] = conf.forward_proxy_bypass
+    if conf.forward_proxy is not None:
+        service_args['forwardProxyEnabled'] = conf.forward_proxy
+    if conf.insert_empty_fragments is not None:
+        service_args['insertEmptyFragmentsEnabled'] = conf.insert_empty_fragments
+    if conf.single_use_dh is not None:
+        service_args['singleUseDhEnabled'] = conf.single_use_dh
 
     # Set TLS versions
-    # Enable/Disable all SSL versions at once
-    service_args['sslEnabled'] = lib_consts.SSL_VERSION_3 in tls_versions
-    service_args['tls1_0Enabled'] = lib_consts.TLS_VERSION_1 in tls_versions
-    # Note: tls_1_1 is only supported in tmos version 14.0+
-    service_args['tls1_1Enabled'] = lib_consts.TLS_VERSION_1_1 in tls_versions
-    service_args['tls1_2Enabled'] = lib_consts.TLS_VERSION_1_2 in tls_versions
+    service_args.update({flag: version in tls_versions for version, flag in TLS_VERSION_FLAGS.items()})
     # Control Renegotiation depends on HTTP2
     service_args['renegotiationEnabled'] = allow_renegotiation
 
+    return service_args
+
+
+def _clear_caches(*args, **kwargs):
+    """ Mutate hook, drops cached TLS options and arguments when the configuration is reloaded """
+    global _SERVER_CONF, _CLIENT_CONF
+    _SERVER_CONF = None
+    _CLIENT_CONF = None
+    _build_tls_server_args.cache_clear()
+    _build_tls_client_args.cache_clear()
+
+
+CONF.register_mutate_hook(_clear_caches)
+
+
+def get_tls_server(certificate_ids, listener, authentication_ca=None, allow_renegotiation=True, cipher_group=None):
+    """ returns AS3 TLS_Server
+
+    :param certificate_ids: reference ids to AS3 certificate objs
+    :param listener: Listener object
+    :param authentication_ca: reference id to AS3 auth-ca obj
+    :param allow_renegotiation: Whether to allow TLS renegotiation. Has to be False when HTTP2 is used.
+    :param cipher_group: name of Cipher Group has to be used for this listener
+    :return: TLS_Server
+    """
+
+    # LBs created before Ussuri may have TLS-enabled listeners with no tls_versions specified
+    tls_versions = listener.tls_versions or CONF.api_settings.default_listener_tls_versions
+
+    service_args = _build_tls_server_args(
+        cipher_group, frozenset(tls_versions),
+        listener.client_authentication if authentication_ca else None,
+        authentication_ca, allow_renegotiation,
+        _get_server_conf())
+    certificates = list(_get_certificates(frozenset(certificate_ids)))
+    return TLS_Server(certificates=certificates, **service_args)
+
+
+def get_tls_client(pool, trust_ca=None, client_cert=None, crl_file=None, allow_renegotiation=True, cipher_group=None):
+    """ returns AS3 TLS_Client
+
+    :param pool: The pool for which to create the TLS client
+    :param trust_ca: reference to AS3 trust_ca obj
+    :param client_cert: reference to AS3 client_cert
+    :param crl_file: reference to AS3 crl_file
+    :param allow_renegotiation: Whether to allow TLS renegotiation. Has to be False when HTTP2 is used.
+    :param cipher_group: name of Cipher Group has to be used for this pool
+    :return: TLS_Client
+    """
+
+    # LBs created before Ussuri may have TLS-enabled pools with no tls_versions specified
+    tls_versions = pool.tls_versions or CONF.api_settings.default_pool_tls_versions
+
+    service_args = _build_tls_client_args(
+        trust_ca, client_cert, crl_file, cipher_group, frozenset(tls_versions), allow_renegotiation,
+        _get_client_conf())
     return TLS_Client(**service_args)
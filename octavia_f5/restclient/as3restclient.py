@@ -12,10 +12,11 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+from concurrent import futures
 from urllib import parse
 import time
 
-import futurist
 import prometheus_client as prometheus
 from oslo_config import cfg
 from oslo_log import log as logging
@@ -23,7 +24,7 @@ from oslo_log import log as logging
 from octavia_f5.restclient import as3logging
 from octavia_f5.restclient.as3classes import AS3
 from octavia_f5.restclient.bigip import bigip_auth, bigip_restclient
-from octavia_f5.utils import exceptions
+from octavia_f5.utils import exceptions, json_utils
 
 CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
@@ -33,7 +34,17 @@ AS3_INFO_PATH = AS3_PATH + '/info'
 AS3_TASKS_PATH = AS3_PATH + '/task/{}'
 
 ASYNC_TIMEOUT = 90  # 90 seconds
-AS3_TASK_POLL_INTERVAL = 5
+# Task polling interval, starting with 250ms and doubling up to 5 seconds
+AS3_TASK_POLL_INTERVAL_INITIAL = 0.25
+AS3_TASK_POLL_INTERVAL_MAX = 5
+AS3_TASK_POLL_INTERVAL_FACTOR = 2
+# First poll of a task happens after its estimated duration, at most after 1 second
+AS3_TASK_FIRST_POLL_MAX = 1.0
+# Number of finished tasks the duration estimate is based on
+AS3_TASK_DURATION_SAMPLES = 32
+AS3_TASK_WORKERS = 8
+# Buckets (in seconds) of the AS3 request duration histograms
+AS3_DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 90)
 
 
 class AS3RestClient(bigip_restclient.BigIPRestClient):
@@ -44,23 +55,30 @@ class AS3RestClient(bigip_restclient.BigIPRestClient):
     """
     _metric_httpstatus = prometheus.metrics.Counter(
         'octavia_as3_httpstatus', 'Number of HTTP statuses in responses to AS3 requests', ['method', 'statuscode'])
-    _metric_post_duration = prometheus.metrics.Summary(
-        'octavia_as3_post_duration', 'Time it needs to send a POST request to AS3')
+    _metric_post_duration = prometheus.metrics.Histogram(
+        'octavia_as3_post_duration', 'Time it needs to send a POST request to AS3', buckets=AS3_DURATION_BUCKETS)
     _metric_post_exceptions = prometheus.metrics.Counter(
         'octavia_as3_post_exceptions', 'Number of exceptions at POST requests sent to AS3')
-    _metric_patch_duration = prometheus.metrics.Summary(
-        'octavia_as3_patch_duration', 'Time it needs to send a PATCH request to AS3')
+    _metric_patch_duration = prometheus.metrics.Histogram(
+        'octavia_as3_patch_duration', 'Time it needs to send a PATCH request to AS3', buckets=AS3_DURATION_BUCKETS)
     _metric_patch_exceptions = prometheus.metrics.Counter(
         'octavia_as3_patch_exceptions', 'Number of exceptions at PATCH request sent to AS3')
-    _metric_delete_duration = prometheus.metrics.Summary(
-        'octavia_as3_delete_duration', 'Time it needs to send a DELETE request to AS3')
+    _metric_delete_duration = prometheus.metrics.Histogram(
+        'octavia_as3_delete_duration', 'Time it needs to send a DELETE request to AS3', buckets=AS3_DURATION_BUCKETS)
     _metric_delete_exceptions = prometheus.metrics.Counter(
         'octavia_as3_delete_exceptions', 'Number of exceptions at DELETE request sent to AS3')
 
     def __init__(self, bigip_url, auth=None):
-        self.task_watcher = futurist.ThreadPoolExecutor(max_workers=1)
+        self.task_watcher = futures.ThreadPoolExecutor(max_workers=AS3_TASK_WORKERS,
+                                                       thread_name_prefix='as3-task')
+        # (payload size, duration) of recently finished AS3 tasks
+        self.task_durations = collections.deque(maxlen=AS3_TASK_DURATION_SAMPLES)
         verify = CONF.f5_agent.bigip_verify
         super(AS3RestClient, self).__init__(bigip_url, verify, auth)
+        self.headers.update({'Accept': 'application/json'})
+        # AS3 URLs only depend on the (fixed) endpoint, derive them once
+        self.declare_url = self.get_url(AS3_DECLARE_PATH)
+        self.tasks_url = self.get_url(AS3_TASKS_PATH)
         if CONF.f5_agent.prometheus:
             self.hooks['response'].append(self.metric_response_hook)
         self.hooks['response'].append(self.error_response_hook)
@@ -75,7 +93,7 @@ class AS3RestClient(bigip_restclient.BigIPRestClient):
         error = False
         if 'application/json' in r.headers.get('Content-Type'):
             try:
-                results = r.json()
+                results = json_utils.loads(r.content)
                 for result in results.get('results', [results]):
                     # iterate all results
                     if result['code'] == 404 and 'Public URI path not registered.' in result['message']:
@@ -100,8 +118,8 @@ class AS3RestClient(bigip_restclient.BigIPRestClient):
 
         def log_response(r, *args, **kwargs):
             # Log every successful request and response with debugging level
-            if r.ok:
-                LOG.debug(as3logging.get_response_log(r))
+            if r.ok and LOG.isEnabledFor(logging.DEBUG):
+                LOG.debug("%s", as3logging.LazyResponseLog(r))
 
         LOG.debug("Installing AS3 debug hook for '%s'", self.hostname)
         self.hooks['response'].insert(0, log_response)
@@ -116,54 +134,87 @@ class AS3RestClient(bigip_restclient.BigIPRestClient):
             # Process AS3 response
             if r.status_code == 202:
                 # ASYNC Task
-                task_id = r.json()['id']
-                fut = self.task_watcher.submit(self.wait_for_task_finished, task_id)
+                task_id = json_utils.loads(r.content)['id']
+                fut = self.task_watcher.submit(self.wait_for_task_finished, task_id, len(r.request.body or ''))
                 r = fut.result(timeout=ASYNC_TIMEOUT)
 
                 if 'application/json' in r.headers.get('Content-Type'):
                     try:
                         # Re-use AS3 task code as as response code
-                        for result in r.json()['results']:
+                        for result in json_utils.loads(r.content)['results']:
                             r.status_code = result['code']
                     except (KeyError, ValueError):
                         pass
         return r
 
-    def wait_for_task_finished(self, task_id):
+    def estimate_task_duration(self, payload_size):
+        """ Estimates the duration of an AS3 task, based on the duration per byte of recently finished tasks
+        :param payload_size: size of the declaration in bytes
+        :return: estimated duration in seconds, None if no task finished yet
+        """
+        samples = list(self.task_durations)
+        total_size = sum(size for size, _ in samples)
+        if not total_size:
+            return None
+        return payload_size * sum(duration for _, duration in samples) / total_size
+
+    def wait_for_task_finished(self, task_id, payload_size=0):
         """ Waits for AS3 task to be finished successfully
         :param task_id: task id to be fetched
-        :return: request result
+        :param payload_size: size of the declaration in bytes, used to delay the first poll
+        :return: request result, last task status if the task didn't finish within ASYNC_TIMEOUT
         """
         LOG.info("ASync task '%s' being monitored...", task_id)
-        while True:
-            task = super(AS3RestClient, self).get(path=AS3_TASKS_PATH.format(task_id))
+        start = time.time()
+        estimate = self.estimate_task_duration(payload_size)
+        if estimate is None:
+            interval = AS3_TASK_POLL_INTERVAL_INITIAL
+        else:
+            interval = min(max(estimate, AS3_TASK_POLL_INTERVAL_INITIAL), AS3_TASK_FIRST_POLL_MAX)
+        task = None
+        # Last point in time the task was known to be pending
+        pending_since = start
+        while time.time() - start <= ASYNC_TIMEOUT:
+            time.sleep(interval)
+            interval = min(interval * AS3_TASK_POLL_INTERVAL_FACTOR, AS3_TASK_POLL_INTERVAL_MAX)
+
+            task = super(AS3RestClient, self).get(self.tasks_url.format(task_id))
+            polled = time.time()
             if task.ok:
-                results = task.json()['results']
-
-                # Check for pending tasks
-                if any(res['code'] == 0 for res in results):
-                    time.sleep(AS3_TASK_POLL_INTERVAL)
-                    continue
-
-                return task
-
-            time.sleep(AS3_TASK_POLL_INTERVAL)
+                results = json_utils.loads(task.content)['results']
+
+                # Task finished once no result is pending (code 0)
+                if all(res['code'] != 0 for res in results):
+                    # Task finished somewhere between the previous and this poll, take the middle
+                    # to not account the polling backoff. Tasks without body say nothing about
+                    # the duration per byte.
+                    if payload_size:
+                        self.task_durations.append((payload_size, (pending_since + polled) / 2 - start))
+                    return task
+                pending_since = polled
+
+        # The caller already gave up waiting, stop polling
+        LOG.warning("ASync task '%s' not finished after %d seconds, stop monitoring", task_id, ASYNC_TIMEOUT)
+        return task
 
     @_metric_post_exceptions.count_exceptions()
     @_metric_post_duration.time()
     def post(self, tenants, payload):
-        url = '{}/{}'.format(self.get_url(AS3_DECLARE_PATH), ','.join(tenants))
+        url = '{}/{}'.format(self.declare_url, ','.join(tenants))
+        body = payload.serialize()
         params = {}
-        if CONF.f5_agent.async_mode:
+        # Small declarations can be applied synchronously, saving the task polling
+        if CONF.f5_agent.async_mode and len(body) > CONF.f5_agent.async_payload_threshold:
             params['async'] = 'true'
         if CONF.f5_agent.unsafe_mode:
             params['unsafe'] = 'true'
-        return super(AS3RestClient, self).post(url, json=payload.to_dict(), params=params)
+        return super(AS3RestClient, self).post(url, data=body, params=params,
+                                               headers={'Content-Type': 'application/json'})
 
     @_metric_patch_exceptions.count_exceptions()
     @_metric_patch_duration.time()
     def patch(self, tenants, patch_body):
-        url = self.get_url(AS3_DECLARE_PATH)
+        url = self.declare_url
         return super(AS3RestClient, self).patch(url, json=patch_body)
 
     @_metric_delete_exceptions.count_exceptions()
@@ -172,7 +223,7 @@ class AS3RestClient(bigip_restclient.BigIPRestClient):
         if not tenants:
             raise exceptions.DeleteAllTenantsException()
 
-        url = '{}/{}'.format(self.get_url(AS3_DECLARE_PATH), ','.join(tenants))
+        url = '{}/{}'.format(self.declare_url, ','.join(tenants))
         return super(AS3RestClient, self).delete(url)
 
     def info(self):
@@ -181,7 +232,7 @@ class AS3RestClient(bigip_restclient.BigIPRestClient):
         return dict(device=self.hostname, **info.json())
 
     def get_tenants(self):
-        tenants = self.get(self.get_url(AS3_DECLARE_PATH), params={'filterClass': 'Application'})
+        tenants = self.get(self.declare_url, params={'filterClass': 'Application'})
         tenants.raise_for_status()
         if tenants.status_code == 204:
             return {}
@@ -197,16 +248,14 @@ class AS3ExternalContainerRestClient(AS3RestClient):
 
     def __init__(self, bigip_url, as3_url, auth=None):
         self.as3_url = parse.urlsplit(as3_url, allow_fragments=False)
+        self._as3_prefix = '{}://{}'.format(self.as3_url.scheme, self.as3_url.netloc)
         super(AS3ExternalContainerRestClient, self).__init__(bigip_url, auth)
 
     def get_url(self, url):
         """ Override host for AS3 declarations. """
         if url.startswith(AS3_PATH):
             # derive external as3 container url
-            url_tuple = parse.SplitResult(
-                scheme=self.as3_url.scheme, netloc=self.as3_url.netloc,
-                path=url, query='', fragment='')
-            return parse.urlunsplit(url_tuple)
+            return self._as3_prefix + url
 
         # derive regular bigip url
         return super(AS3ExternalContainerRestClient, self).get_url(url)
@@ -13,6 +13,8 @@
 # under the License.
 
 from urllib import parse
+import threading
+import time
 
 import requests
 import tenacity
@@ -20,6 +22,11 @@ from requests.auth import HTTPBasicAuth, AuthBase
 
 BIGIP_TOKEN_HEADER = 'X-F5-Auth-Token'
 BIGIP_TOKEN_MAX_TIMEOUT = '36000'
+BIGIP_TOKEN_DEFAULT_TIMEOUT = 1200
+# Refresh tokens this many seconds before they expire
+BIGIP_TOKEN_REFRESH_MARGIN = 60
+# Retry a failed refresh ahead of expiry after this many seconds
+BIGIP_TOKEN_REFRESH_BACKOFF = 30
 BIGIP_TOKENS_PATH = '/mgmt/shared/authz/tokens'
 BIGIP_LOGIN_PATH = '/mgmt/shared/authn/login'
 
@@ -43,6 +50,8 @@ class BigIPTokenAuth(AuthBase):
         self.password = parse.unquote(parse_result.password)
         # Use single global token
         self.token = None
+        self.token_expires = None
+        self._refresh_lock = threading.Lock()
 
     def handle_401(self, r, **kwargs):
         """ This response hook will fetch a fresh token if encountered an 401 response code.
@@ -68,7 +77,28 @@ class BigIPTokenAuth(AuthBase):
 
         return _r
 
+    def refresh_token(self):
+        """ Refreshes the token ahead of expiry, sparing a rejected request and its resend.
+            Makes a single login attempt, on failure the old token is kept (a 401 response
+            will be handled by handle_401) and the refresh is retried after a backoff.
+        """
+        # Only one thread refreshes, others continue with the still valid token
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            if not self.token_expires or time.time() < self.token_expires:
+                # Refreshed by another thread meanwhile
+                return
+            BigIPTokenAuth.get_token.retry_with(stop=tenacity.stop_after_attempt(1))(self)
+        except (requests.RequestException, tenacity.RetryError):
+            self.token_expires = time.time() + BIGIP_TOKEN_REFRESH_BACKOFF
+        finally:
+            self._refresh_lock.release()
+
     def __call__(self, r):
+        if self.token and self.token_expires and time.time() >= self.token_expires:
+            self.refresh_token()
+
         # No token, no fun
         if self.token:
             r.headers[BIGIP_TOKEN_HEADER] = self.token
@@ -109,6 +139,8 @@ class BigIPTokenAuth(AuthBase):
 
         # Increase timeout to max of 10 hours
         patch_timeout = {"timeout": BIGIP_TOKEN_MAX_TIMEOUT}
-        requests.patch("{}/{}".format(parse.urljoin(self.url, BIGIP_TOKENS_PATH), token),
-                       auth=auth, json=patch_timeout, timeout=10, verify=False)
+        r = requests.patch("{}/{}".format(parse.urljoin(self.url, BIGIP_TOKENS_PATH), token),
+                           auth=auth, json=patch_timeout, timeout=10, verify=False)
+        timeout = int(BIGIP_TOKEN_MAX_TIMEOUT) if r.ok else BIGIP_TOKEN_DEFAULT_TIMEOUT
+        self.token_expires = time.time() + timeout - BIGIP_TOKEN_REFRESH_MARGIN
         return token
@@ -0,0 +1,88 @@
+# Copyright 2023 SAP SE
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from unittest import mock
+
+from octavia_lib.common import constants as lib_consts
+from oslo_config import cfg
+from oslo_config import fixture as oslo_fixture
+
+from octavia.db import models
+from octavia.tests.unit import base
+from octavia_f5.common import config  # noqa
+from octavia_f5.restclient.as3objects import tls
+
+
+class TestTLS(base.TestCase):
+    def setUp(self):
+        self.conf = self.useFixture(oslo_fixture.Config(cfg.CONF))
+        super(TestTLS, self).setUp()
+        # TLS options are snapshotted, reset them for every test
+        tls._clear_caches()
+        self.addCleanup(tls._clear_caches)
+
+    @staticmethod
+    def _get_listener(tls_versions=None, client_authentication='NONE'):
+        mock_listener = mock.Mock(spec=models.Listener)
+        mock_listener.tls_versions = tls_versions or [lib_consts.TLS_VERSION_1_2]
+        mock_listener.client_authentication = client_authentication
+        return mock_listener
+
+    def test_get_tls_server(self):
+        listener = self._get_listener(client_authentication='MANDATORY')
+        tls_server = tls.get_tls_server(['cert_1', 'cert_1'], listener, 'auth_ca',
+                                        allow_renegotiation=False, cipher_group='cg')
+        self.assertEqual('TLS_Server', getattr(tls_server, 'class'))
+        self.assertEqual([{'certificate': 'cert_1'}], tls_server.certificates)
+        self.assertEqual({'use': 'cg'}, tls_server.cipherGroup)
+        self.assertEqual('require', tls_server.authenticationMode)
+        self.assertEqual('auth_ca', tls_server.authenticationTrustCA)
+        self.assertTrue(tls_server.tls1_2Enabled)
+        self.assertFalse(tls_server.tls1_0Enabled)
+        self.assertFalse(tls_server.renegotiationEnabled)
+
+    def test_get_tls_server_cached(self):
+        listener = self._get_listener()
+        tls_server_1 = tls.get_tls_server(['cert_1'], listener)
+        tls_server_2 = tls.get_tls_server(['cert_1'], listener)
+        self.assertIsNot(tls_server_1, tls_server_2)
+        self.assertEqual(tls_server_1, tls_server_2)
+        self.assertIsNot(tls_server_1.certificates, tls_server_2.certificates)
+
+    def test_get_tls_server_conf_change(self):
+        listener = self._get_listener()
+        tls_server = tls.get_tls_server(['cert_1'], listener)
+        self.assertFalse(hasattr(tls_server, 'staplerOCSPEnabled'))
+
+        self.conf.config(group='f5_tls_server', stapler_ocsp=True)
+        tls._clear_caches()
+        tls_server = tls.get_tls_server(['cert_1'], listener)
+        self.assertTrue(tls_server.staplerOCSPEnabled)
+
+    def test_get_tls_client(self):
+        mock_pool = mock.Mock(spec=models.Pool)
+        mock_pool.tls_versions = [lib_consts.TLS_VERSION_1_2, lib_consts.TLS_VERSION_1_1]
+        self.conf.config(group='f5_tls_client', single_use_dh=True)
+        tls._clear_caches()
+
+        tls_client = tls.get_tls_client(mock_pool, trust_ca='trust_ca', client_cert='client_cert')
+        self.assertEqual('TLS_Client', getattr(tls_client, 'class'))
+        self.assertEqual('trust_ca', tls_client.trustCA.use)
+        self.assertTrue(tls_client.validateCertificate)
+        self.assertEqual('client_cert', tls_client.clientCertificate)
+        self.assertTrue(tls_client.singleUseDhEnabled)
+        self.assertTrue(tls_client.tls1_1Enabled)
+        self.assertTrue(tls_client.tls1_2Enabled)
+        self.assertFalse(tls_client.sslEnabled)
+        self.assertTrue(tls_client.renegotiationEnabled)
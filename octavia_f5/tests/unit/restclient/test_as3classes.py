@@ -12,6 +12,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import json
+
 from octavia.tests.unit import base
 from octavia_f5.restclient import as3classes, as3exceptions
 from octavia_f5.restclient.as3classes import constants
@@ -27,6 +29,17 @@ class TestAS3Classes(base.TestCase):
         as3 = {'action': 'deploy', 'class': 'AS3', 'persist': True}
         self.assertTrue(as3.items() <= as3classes.AS3().to_dict().items())
 
+    def test_as3_serialize(self):
+        as3_obj = as3classes.AS3()
+        serialized = as3_obj.serialize()
+        self.assertEqual(as3_obj.to_dict(), json.loads(serialized))
+        self.assertIs(serialized, as3_obj.serialize())
+        self.assertNotIn('_serialized', as3_obj.to_dict())
+
+        # modification invalidates the cached serialization
+        as3_obj.set_action('dry-run')
+        self.assertEqual('dry-run', json.loads(as3_obj.serialize())['action'])
+
     def test_adc(self):
         # erroneous creation
         self.assertRaises(as3exceptions.RequiredKeyMissingException, as3classes.ADC)
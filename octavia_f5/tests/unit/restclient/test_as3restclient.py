@@ -0,0 +1,122 @@
+# Copyright 2023 SAP SE
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import itertools
+import json
+from unittest import mock
+
+from oslo_config import cfg
+from oslo_config import fixture as oslo_fixture
+
+from octavia.tests.unit import base
+from octavia_f5.common import config  # noqa
+from octavia_f5.restclient import as3restclient
+from octavia_f5.restclient.bigip import bigip_restclient
+
+
+def _task_response(code):
+    response = mock.Mock(ok=True)
+    response.content = '{{"results": [{{"code": {}}}]}}'.format(code).encode()
+    return response
+
+
+class TestAS3RestClient(base.TestCase):
+    def setUp(self):
+        self.conf = self.useFixture(oslo_fixture.Config(cfg.CONF))
+        self.conf.config(group='f5_agent', prometheus=False)
+        super(TestAS3RestClient, self).setUp()
+        self.client = as3restclient.AS3RestClient('https://localhost')
+
+    @mock.patch.object(as3restclient, 'time')
+    @mock.patch.object(bigip_restclient.BigIPRestClient, 'get')
+    def test_wait_for_task_finished_timeout(self, mock_get, mock_time):
+        mock_time.time.side_effect = itertools.count(0, 10)
+        mock_get.return_value = _task_response(0)
+
+        task = self.client.wait_for_task_finished('task_id')
+        self.assertIs(mock_get.return_value, task)
+        self.assertLessEqual(mock_get.call_count, as3restclient.ASYNC_TIMEOUT // 10)
+        self.assertEqual(0, len(self.client.task_durations))
+
+    @mock.patch.object(as3restclient, 'time')
+    @mock.patch.object(bigip_restclient.BigIPRestClient, 'get')
+    def test_wait_for_task_finished_duration(self, mock_get, mock_time):
+        # start, loop check, pending poll, loop check, finished poll
+        mock_time.time.side_effect = [0.0, 0.0, 0.5, 0.5, 1.0]
+        mock_get.side_effect = [_task_response(0), _task_response(200)]
+
+        task = self.client.wait_for_task_finished('task_id', 100)
+        self.assertEqual(2, mock_get.call_count)
+        self.assertEqual(200, json.loads(task.content)['results'][0]['code'])
+        # finished between the two polls
+        self.assertEqual([(100, 0.75)], list(self.client.task_durations))
+
+    @mock.patch.object(as3restclient, 'time')
+    @mock.patch.object(bigip_restclient.BigIPRestClient, 'get')
+    def test_wait_for_task_finished_without_body(self, mock_get, mock_time):
+        mock_time.time.return_value = 0.0
+        mock_get.return_value = _task_response(200)
+
+        self.client.wait_for_task_finished('task_id', 0)
+        self.assertEqual(0, len(self.client.task_durations))
+
+    def test_estimate_task_duration(self):
+        self.assertIsNone(self.client.estimate_task_duration(100))
+
+        self.client.task_durations.extend([(100, 1.0), (300, 1.0)])
+        self.assertEqual(1.0, self.client.estimate_task_duration(200))
+        self.assertEqual(0.5, self.client.estimate_task_duration(100))
+
+    @mock.patch.object(as3restclient, 'time')
+    @mock.patch.object(bigip_restclient.BigIPRestClient, 'get')
+    def _get_first_poll_delay(self, samples, mock_get, mock_time):
+        mock_time.time.return_value = 0.0
+        mock_get.return_value = _task_response(200)
+        self.client.task_durations.clear()
+        self.client.task_durations.extend(samples)
+
+        self.client.wait_for_task_finished('task_id', 100)
+        return mock_time.sleep.call_args_list[0][0][0]
+
+    def test_first_poll_delay(self):
+        # no samples
+        self.assertEqual(as3restclient.AS3_TASK_POLL_INTERVAL_INITIAL, self._get_first_poll_delay([]))
+        # estimated duration
+        self.assertEqual(0.5, self._get_first_poll_delay([(100, 0.5)]))
+        # clamped to the initial interval and the maximum delay of the first poll
+        self.assertEqual(as3restclient.AS3_TASK_POLL_INTERVAL_INITIAL, self._get_first_poll_delay([(100, 0.01)]))
+        self.assertEqual(as3restclient.AS3_TASK_FIRST_POLL_MAX, self._get_first_poll_delay([(100, 30.0)]))
+
+    def _post(self, body):
+        payload = mock.Mock()
+        payload.serialize.return_value = body
+        with mock.patch.object(bigip_restclient.BigIPRestClient, 'post') as mock_post:
+            self.client.post(['tenant'], payload)
+        mock_post.assert_called_once_with(
+            'https://localhost/mgmt/shared/appsvcs/declare/tenant', data=body, params=mock.ANY,
+            headers={'Content-Type': 'application/json'})
+        return mock_post.call_args[1]['params']
+
+    def test_post_sync(self):
+        self.conf.config(group='f5_agent', async_mode=False)
+        self.assertNotIn('async', self._post(b'{}'))
+
+    def test_post_async(self):
+        self.conf.config(group='f5_agent', async_mode=True)
+        self.assertEqual('true', self._post(b'{}')['async'])
+
+    def test_post_async_payload_threshold(self):
+        self.conf.config(group='f5_agent', async_mode=True, async_payload_threshold=10)
+        self.assertNotIn('async', self._post(b'{"a": "b"}'))
+        self.assertEqual('true', self._post(b'{"a": "bcdef"}')['async'])
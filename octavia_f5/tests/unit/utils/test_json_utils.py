@@ -0,0 +1,36 @@
+# Copyright 2023 SAP SE
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from unittest import mock
+
+from octavia.tests.unit import base
+from octavia_f5.utils import json_utils
+
+
+class TestJsonUtils(base.TestCase):
+    DATA = {'class': 'AS3', 'declaration': {'tenant': ['a', 1, True, None]}}
+
+    def test_roundtrip(self):
+        serialized = json_utils.dumps(self.DATA)
+        self.assertIsInstance(serialized, bytes)
+        self.assertEqual(self.DATA, json_utils.loads(serialized))
+        self.assertEqual(self.DATA, json_utils.loads(serialized.decode()))
+        self.assertRaises(ValueError, json_utils.loads, b'no json')
+
+    @mock.patch.object(json_utils, 'orjson', None)
+    def test_roundtrip_without_orjson(self):
+        serialized = json_utils.dumps(self.DATA)
+        self.assertIsInstance(serialized, bytes)
+        self.assertEqual(self.DATA, json_utils.loads(serialized))
+        self.assertRaises(ValueError, json_utils.loads, b'no json')
@@ -51,7 +51,7 @@ class PolicyActionNotSupported(AS3Exception):
 
 class MonitorDeletionException(AS3Exception):
     def __init__(self, tenant, application, monitor):
-        super(MonitorDeletionException).__init__()
+        super(MonitorDeletionException, self).__init__(tenant, application, monitor)
         self.tenant = tenant
         self.application = application
         self.monitor = monitor
@@ -59,5 +59,5 @@ class MonitorDeletionException(AS3Exception):
 
 class DeleteAllTenantsException(Exception):
     def __init__(self):
-        super(DeleteAllTenantsException).__init__()
         self.message = 'Delete called without tenant, would wipe all AS3 Declaration, ignoring.'
+        super(DeleteAllTenantsException, self).__init__(self.message)
@@ -0,0 +1,49 @@
+# Copyright 2023 SAP SE
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""JSON (de)serialization helpers, using orjson with a fallback to the stdlib json module.
+
+Note that orjson rejects dicts with non-str keys (raising TypeError), while stdlib json
+coerces int/float/bool/None keys to strings.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj):
+    """ Serializes obj to JSON, uses orjson if available.
+
+    :param obj: JSON serializable object
+    :return: bytes
+    """
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def loads(data):
+    """ Deserializes JSON, uses orjson if available.
+
+    :param data: bytes or str containing a JSON document
+    :raises ValueError: if data is not valid JSON
+    :return: deserialized object
+    """
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)